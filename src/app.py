@@ -1,27 +1,33 @@
 # File: /src/app.py
 
 import streamlit as st
+import streamlit.components.v1 as components
 import geemap.foliumap as geemap
 import datetime
 import ee
-from typing import Tuple
+from typing import Any, Dict, List, Tuple
 import pandas as pd
 import altair as alt
 
 # Import backend modules
 from gee_processing.image_collection import (
+    EMPTY_BAND,
     get_landsat_collection,
     get_sentinel2_collection,
     get_single_landsat_image,
     get_single_sentinel2_image,
 )
-from gee_processing.spectral_indices import add_indices_to_collection
+from gee_processing.spectral_indices import (
+    add_indices_to_collection,
+    calculate_indices,
+)
 from gee_processing.lst_calculation import (
     add_lst_to_collection,
     get_lst_parameters,
     calculate_lst,
 )
 from gee_processing.regression_model import create_ridge_regression_model
+from gee_processing.utils import fetch_once
 from gee_processing.downscaling import downscale_lst
 from gee_processing.visualization import (
     create_map,
@@ -31,13 +37,23 @@ from gee_processing.visualization import (
     create_scatter_plot,
 )
 
-# Initialize Earth Engine
-ee.Initialize(project="earth-engine-web-app")
+
+@st.cache_resource(show_spinner=False)
+def init_earth_engine() -> bool:
+    ee.Initialize(project="earth-engine-web-app")
+    return True
+
+
+# Initialize Earth Engine once per process rather than on every rerun. This
+# stays at module level because ROI below needs an initialized client.
+init_earth_engine()
 
 # Define global variables
 ROI = ee.Geometry.Rectangle(
     [21.134189623651263, 48.57888560664585, 21.433567065057513, 48.82947658234015]
 )
+MAP_HEIGHT = 600
+HISTOGRAM_BINS = 32
 
 
 def main():
@@ -55,9 +71,13 @@ def main():
     col1, col2 = st.columns([2, 1])
 
     with col1:
-        map_obj = create_map_view()
+        st.subheader("Map View")
         map_placeholder = st.empty()
-        map_placeholder.pydeck_chart(map_obj.to_streamlit(height=600))
+        # Keep one map per session; update_map replaces it and bumps map_version
+        if "map_obj" not in st.session_state:
+            st.session_state.map_obj = create_map_view()
+            st.session_state.map_version = 0
+        render_map(map_placeholder)
 
     with col2:
         results_placeholder = st.empty()
@@ -78,8 +98,21 @@ def main():
                     "Failed to process data. Please check the console for more information."
                 )
             else:
-                update_map(map_obj, landsat_image, sentinel_image, downscaled_lst)
-                map_placeholder.pydeck_chart(map_obj.to_streamlit(height=600))
+                try:
+                    display_values = fetch_display_values(
+                        landsat_image, downscaled_lst
+                    )
+                except ee.EEException as e:
+                    st.error(f"Error fetching results: {str(e)}")
+                else:
+                    update_map(
+                        landsat_image,
+                        sentinel_image,
+                        downscaled_lst,
+                        display_values["lst_params"],
+                    )
+                    render_map(map_placeholder)
+                    update_results(results_placeholder, display_values)
 
 
 def create_sidebar() -> Tuple[datetime.date, datetime.date, str, float]:
@@ -118,12 +151,25 @@ def display_about_section():
 
 
 def create_map_view() -> geemap.Map:
-    st.subheader("Map View")
     map_obj = create_map(center=[21.2611, 48.7164], zoom=10)
     map_obj.add_basemap("HYBRID")
     return map_obj
 
 
+def map_to_html(map_obj: geemap.Map) -> str:
+    return map_obj.to_html(height=f"{MAP_HEIGHT}px")
+
+
+def render_map(placeholder):
+    # Regenerate the session map's HTML only when update_map has replaced the map
+    if st.session_state.get("map_html_version") != st.session_state.map_version:
+        st.session_state.map_html = map_to_html(st.session_state.map_obj)
+        st.session_state.map_html_version = st.session_state.map_version
+
+    with placeholder.container():
+        components.html(st.session_state.map_html, height=MAP_HEIGHT)
+
+
 def display_results(placeholder):
     placeholder.subheader("Analysis Results")
     placeholder.write("Charts and statistics will be displayed here after processing.")
@@ -140,55 +186,10 @@ def process_data(
     print(f"Cloud cover threshold: {cloud_cover}%")
 
     try:
-        # Get Landsat and Sentinel-2 collections
-        landsat_coll = get_landsat_collection(
-            start_date.isoformat(),
-            end_date.isoformat(),
-            ROI,
-            cloud_cover,
-            landsat_collection,
-        )
-        sentinel_coll = get_sentinel2_collection(
-            start_date.isoformat(), end_date.isoformat(), ROI, cloud_cover
-        )
-
-        print("Landsat collection size:", landsat_coll.size().getInfo())
-        print("Sentinel-2 collection size:", sentinel_coll.size().getInfo())
-
-        if landsat_coll.size().getInfo() == 0 or sentinel_coll.size().getInfo() == 0:
-            raise ValueError(
-                "No images found in the specified date range and cloud cover threshold."
-            )
-
-        # Add spectral indices to Landsat collection
-        landsat_coll = add_indices_to_collection(landsat_coll, "landsat")
-        print("Spectral indices added to Landsat collection")
-
-        # Add LST to Landsat collection
-        landsat_coll = add_lst_to_collection(landsat_coll)
-        print("LST added to Landsat collection")
-
-        # Get a single image from each collection
-        landsat_image = get_single_landsat_image(
-            landsat_coll, start_date.isoformat(), end_date.isoformat()
-        )
-        if landsat_image is None:
-            raise ValueError("Failed to retrieve a valid Landsat image")
-
-        # Use the same date range for Sentinel-2
-        sentinel_image = get_single_sentinel2_image(
-            sentinel_coll, start_date.isoformat(), end_date.isoformat()
-        )
-        if sentinel_image is None:
-            raise ValueError("Failed to retrieve a valid Sentinel-2 image")
-
-        # Print Landsat image bands for debugging
-        print("Landsat image bands:", landsat_image.bandNames().getInfo())
-
-        # Create regression model
-        regression_coefficients = create_ridge_regression_model(
-            landsat_image, "LST", ["NDVI", "NDBI", "NDWI"], ROI
+        landsat_id, sentinel_id, regression_coefficients = prepare_model_inputs(
+            start_date, end_date, landsat_collection, cloud_cover
         )
+        landsat_image, sentinel_image = load_scene_images(landsat_id, sentinel_id)
 
         # Downscale LST
         downscaled_lst = downscale_lst(
@@ -208,18 +209,212 @@ def process_data(
         return None, None, None
 
 
+def load_scene_images(landsat_id: str, sentinel_id: str) -> Tuple[ee.Image, ee.Image]:
+    # Rebuild the derived bands on top of the cached scene IDs
+    landsat_image = ee.Image(
+        calculate_lst(calculate_indices(ee.Image(landsat_id), "landsat"))
+    )
+    sentinel_image = calculate_indices(ee.Image(sentinel_id), "sentinel2")
+    return landsat_image, sentinel_image
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def prepare_model_inputs(
+    start_date: datetime.date,
+    end_date: datetime.date,
+    landsat_collection: str,
+    cloud_cover: float,
+) -> Tuple[str, str, Dict[str, float]]:
+    # Cached on the sidebar controls: reruns with the same parameters skip the
+    # collection queries and the regression fit. Failed runs are not cached.
+    # Both preparations only build lazy Earth Engine graphs; the first request
+    # is the fetch_once below
+    landsat_image = prepare_landsat_image(
+        start_date, end_date, landsat_collection, cloud_cover
+    )
+    sentinel_image = prepare_sentinel_image(start_date, end_date, cloud_cover)
+
+    # Fetch everything the pre-checks need in a single round-trip. An empty
+    # collection yields a placeholder image with only the EMPTY_BAND band.
+    info = fetch_once(
+        {
+            "ls_bands": landsat_image.bandNames(),
+            "s2_bands": sentinel_image.bandNames(),
+            "ls_id": landsat_image.get("system:id"),
+            "s2_id": sentinel_image.get("system:id"),
+        }
+    )
+
+    if EMPTY_BAND in info["ls_bands"] or EMPTY_BAND in info["s2_bands"]:
+        raise ValueError(
+            "No images found in the specified date range and cloud cover threshold."
+        )
+
+    # Print image bands for debugging
+    print("Landsat image bands:", info["ls_bands"])
+    print("Sentinel-2 image bands:", info["s2_bands"])
+
+    # Create regression model
+    regression_coefficients = create_ridge_regression_model(
+        landsat_image, "LST", ["NDVI", "NDBI", "NDWI"], ROI, cache_key=info["ls_id"]
+    )
+
+    return info["ls_id"], info["s2_id"], regression_coefficients
+
+
+def prepare_landsat_image(
+    start_date: datetime.date,
+    end_date: datetime.date,
+    landsat_collection: str,
+    cloud_cover: float,
+) -> ee.Image:
+    landsat_coll = get_landsat_collection(
+        start_date.isoformat(),
+        end_date.isoformat(),
+        ROI,
+        cloud_cover,
+        landsat_collection,
+    )
+
+    # Add spectral indices to Landsat collection
+    landsat_coll = add_indices_to_collection(landsat_coll, "landsat")
+    print("Spectral indices added to Landsat collection")
+
+    # Add LST to Landsat collection
+    landsat_coll = add_lst_to_collection(landsat_coll)
+    print("LST added to Landsat collection")
+
+    return get_single_landsat_image(
+        landsat_coll, start_date.isoformat(), end_date.isoformat()
+    )
+
+
+def prepare_sentinel_image(
+    start_date: datetime.date, end_date: datetime.date, cloud_cover: float
+) -> ee.Image:
+    sentinel_coll = get_sentinel2_collection(
+        start_date.isoformat(), end_date.isoformat(), ROI, cloud_cover
+    )
+
+    # Add spectral indices to Sentinel-2 collection (used by the regression)
+    sentinel_coll = add_indices_to_collection(sentinel_coll, "sentinel2")
+    print("Spectral indices added to Sentinel-2 collection")
+
+    # Use the same date range as for Landsat
+    return get_single_sentinel2_image(
+        sentinel_coll, start_date.isoformat(), end_date.isoformat()
+    )
+
+
+def fetch_display_values(
+    landsat_image: ee.Image, downscaled_lst: ee.Image
+) -> Dict[str, Any]:
+    # Everything the map and the results panel show is requested in a single
+    # getInfo() so Earth Engine evaluates the shared graph once. The charts
+    # only need pixel counts, so they are reduced to histograms server-side.
+    mean_std = ee.Reducer.mean().combine(ee.Reducer.stdDev(), None, True)
+    ls_stats = landsat_image.select("LST").reduceRegion(
+        reducer=mean_std.combine(ee.Reducer.minMax(), None, True),
+        geometry=ROI,
+        scale=30,
+        maxPixels=1e9,
+    )
+
+    histograms = {
+        index: ee.Algorithms.If(
+            ee.Algorithms.IsEqual(ls_stats.get("LST_min"), None),
+            ee.List([]),
+            lst_histogram(landsat_image, index, ls_stats),
+        )
+        for index in ["NDVI", "NDBI", "NDWI"]
+    }
+
+    display_values = fetch_once(
+        {
+            "lst_params": get_lst_parameters(landsat_image),
+            "ls_stats": ls_stats,
+            "ds_stats": downscaled_lst.select("LST_downscaled").reduceRegion(
+                reducer=mean_std, geometry=ROI, scale=10, maxPixels=1e9
+            ),
+            "histograms": histograms,
+        }
+    )
+
+    display_values["histograms"] = {
+        index: histogram_to_frame(
+            groups,
+            display_values["ls_stats"].get("LST_min"),
+            display_values["ls_stats"].get("LST_max"),
+        )
+        for index, groups in display_values["histograms"].items()
+    }
+    return display_values
+
+
+def lst_histogram(
+    landsat_image: ee.Image, index: str, ls_stats: ee.Dictionary
+) -> ee.List:
+    # 2-D histogram of a spectral index against LST: the index is binned over
+    # [-1, 1] within each of HISTOGRAM_BINS equal-width LST bins
+    lst_min = ee.Number(ls_stats.get("LST_min"))
+    lst_max = ee.Number(ls_stats.get("LST_max"))
+    lst_bin = (
+        landsat_image.select("LST")
+        .subtract(lst_min)
+        .divide(lst_max.subtract(lst_min))
+        .multiply(HISTOGRAM_BINS)
+        .floor()
+        .min(HISTOGRAM_BINS - 1)
+        .toInt()
+        .rename("lst_bin")
+    )
+    return ee.Dictionary(
+        landsat_image.select(index)
+        .addBands(lst_bin)
+        .reduceRegion(
+            reducer=ee.Reducer.fixedHistogram(-1, 1, HISTOGRAM_BINS).group(
+                groupField=1, groupName="lst_bin"
+            ),
+            geometry=ROI,
+            scale=30,
+            maxPixels=1e9,
+        )
+    ).get("groups")
+
+
+def histogram_to_frame(
+    groups: List[Dict[str, Any]], lst_min: float, lst_max: float
+) -> pd.DataFrame:
+    index_step = 2 / HISTOGRAM_BINS
+    lst_step = (lst_max - lst_min) / HISTOGRAM_BINS if groups else 0
+    rows = [
+        {
+            "index_start": index_start,
+            "index_end": index_start + index_step,
+            "lst_start": lst_min + group["lst_bin"] * lst_step,
+            "lst_end": lst_min + (group["lst_bin"] + 1) * lst_step,
+            "count": count,
+        }
+        for group in groups
+        for index_start, count in group["histogram"]
+        if count > 0
+    ]
+    return pd.DataFrame(
+        rows, columns=["index_start", "index_end", "lst_start", "lst_end", "count"]
+    )
+
+
 def update_map(
-    map_obj: geemap.Map,
     landsat_image: ee.Image,
     sentinel_image: ee.Image,
     downscaled_lst: ee.Image,
+    lst_params: Dict[str, Any],
 ):
-    # Clear existing layers
-    map_obj.layers = map_obj.layers[:1]  # Keep only the base layer
+    # Folium has no public API for removing layers, so start from a fresh base map
+    map_obj = create_map_view()
 
     try:
-        # Get LST visualization parameters
-        lst_params = get_lst_parameters(landsat_image)
+        # Fall back to default LST visualization parameters if unavailable
         if lst_params["min"] is None or lst_params["max"] is None:
             st.warning("Unable to retrieve LST parameters. Using default values.")
             lst_params = {"min": 20, "max": 40}
@@ -256,96 +451,61 @@ def update_map(
 
         st.code(traceback.format_exc())
 
+    st.session_state.map_obj = map_obj
+    st.session_state.map_version += 1
 
-def update_results(
-    placeholder,
-    landsat_image: ee.Image,
-    sentinel_image: ee.Image,
-    downscaled_lst: ee.Image,
-):
-    placeholder.empty()
-    placeholder.subheader("Analysis Results")
 
-    if landsat_image is None or sentinel_image is None or downscaled_lst is None:
-        placeholder.warning(
-            "Unable to display results. Some required images are missing."
-        )
-        return
+def update_results(placeholder, display_values: Dict[str, Any]):
+    results = placeholder.container()
+    results.subheader("Analysis Results")
 
     try:
-        # Sample points for creating charts
-        sample_points = landsat_image.select(["NDVI", "NDBI", "NDWI", "LST"]).sample(
-            region=ROI, scale=30, numPixels=500, seed=42
-        )
-
-        # Convert to pandas DataFrame
-        sample_data = sample_points.getInfo()
-        df = pd.DataFrame(
-            [feature["properties"] for feature in sample_data["features"]]
-        )
-
-        # Create scatter plots
-        placeholder.subheader("Spectral Indices vs LST")
+        # Create index vs LST heatmaps
+        results.subheader("Spectral Indices vs LST")
 
         for index in ["NDVI", "NDBI", "NDWI"]:
             chart = (
-                alt.Chart(df)
-                .mark_circle()
+                alt.Chart(display_values["histograms"][index])
+                .mark_rect()
                 .encode(
-                    x=alt.X(index, title=index),
-                    y=alt.Y("LST", title="LST (°C)"),
-                    tooltip=[index, "LST"],
+                    x=alt.X("index_start", title=index),
+                    x2="index_end",
+                    y=alt.Y("lst_start", title="LST (°C)"),
+                    y2="lst_end",
+                    color=alt.Color("count", title="Pixels"),
+                    tooltip=["index_start", "lst_start", "count"],
                 )
                 .properties(width=400, height=300, title=f"LST vs {index}")
             )
-            placeholder.altair_chart(chart, use_container_width=True)
+            results.altair_chart(chart, use_container_width=True)
 
         # Display statistics
-        placeholder.subheader("LST Statistics")
-        landsat_lst_stats = (
-            landsat_image.select("LST")
-            .reduceRegion(
-                reducer=ee.Reducer.mean().combine(ee.Reducer.stdDev(), None, True),
-                geometry=ROI,
-                scale=30,
-                maxPixels=1e9,
-            )
-            .getInfo()
-        )
-
-        downscaled_lst_stats = (
-            downscaled_lst.select("LST_downscaled")
-            .reduceRegion(
-                reducer=ee.Reducer.mean().combine(ee.Reducer.stdDev(), None, True),
-                geometry=ROI,
-                scale=10,
-                maxPixels=1e9,
-            )
-            .getInfo()
-        )
+        results.subheader("LST Statistics")
+        landsat_lst_stats = display_values["ls_stats"]
+        downscaled_lst_stats = display_values["ds_stats"]
 
         if "LST_mean" in landsat_lst_stats and "LST_stdDev" in landsat_lst_stats:
-            placeholder.write(
+            results.write(
                 f"Landsat LST (30m): Mean = {landsat_lst_stats['LST_mean']:.2f}°C, Std Dev = {landsat_lst_stats['LST_stdDev']:.2f}°C"
             )
         else:
-            placeholder.write("Landsat LST statistics are not available.")
+            results.write("Landsat LST statistics are not available.")
 
         if (
             "LST_downscaled_mean" in downscaled_lst_stats
             and "LST_downscaled_stdDev" in downscaled_lst_stats
         ):
-            placeholder.write(
+            results.write(
                 f"Downscaled LST (10m): Mean = {downscaled_lst_stats['LST_downscaled_mean']:.2f}°C, Std Dev = {downscaled_lst_stats['LST_downscaled_stdDev']:.2f}°C"
             )
         else:
-            placeholder.write("Downscaled LST statistics are not available.")
+            results.write("Downscaled LST statistics are not available.")
 
     except Exception as e:
-        placeholder.error(f"An error occurred while updating results: {str(e)}")
+        results.error(f"An error occurred while updating results: {str(e)}")
         import traceback
 
-        placeholder.code(traceback.format_exc())
+        results.code(traceback.format_exc())
 
 
 if __name__ == "__main__":
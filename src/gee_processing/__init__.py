@@ -1,21 +1,29 @@
 from .image_collection import (
+    EMPTY_BAND,
     get_landsat_collection,
     get_sentinel2_collection,
     get_single_landsat_image,
     get_single_sentinel2_image,
 )
 
-from .spectral_indices import calculate_indices, add_indices_to_collection
+from .spectral_indices import (
+    calculate_indices,
+    calculate_indices_landsat,
+    calculate_indices_sentinel2,
+    add_indices_to_collection,
+    local_indices,
+)
 
 from .lst_calculation import calculate_lst, add_lst_to_collection, get_lst_parameters
 
 from .regression_model import (
     create_ridge_regression_model,
     apply_regression_model,
+    apply_regression_and_residuals,
     calculate_residuals,
 )
 
-from .downscaling import downscale_lst
+from .downscaling import downscale_lst, downscale_lst_local
 
 from .visualization import (
     create_map,
@@ -30,29 +38,43 @@ from .visualization import (
 from .utils import (
     export_image_to_asset,
     export_image_to_drive,
+    resolve_export_region,
+    TaskQueue,
+    fetch_once,
     date_to_ee_date,
     add_timestamp_band,
     replace_masked_values,
     clip_to_region,
     get_image_stats,
+    init_highvolume,
+    get_image_stats_parallel,
+    download_images_parallel,
     create_ee_polygon_from_bounds,
     apply_scale_factors,
+    save_index,
+    save_index_zarr,
 )
 
 __all__ = [
+    "EMPTY_BAND",
     "get_landsat_collection",
     "get_sentinel2_collection",
     "get_single_landsat_image",
     "get_single_sentinel2_image",
     "calculate_indices",
+    "calculate_indices_landsat",
+    "calculate_indices_sentinel2",
     "add_indices_to_collection",
+    "local_indices",
     "calculate_lst",
     "add_lst_to_collection",
     "get_lst_parameters",
     "create_ridge_regression_model",
     "apply_regression_model",
+    "apply_regression_and_residuals",
     "calculate_residuals",
     "downscale_lst",
+    "downscale_lst_local",
     "create_map",
     "add_ee_layer",
     "add_colorbar",
@@ -62,11 +84,19 @@ __all__ = [
     "visualize_downscaling_results",
     "export_image_to_asset",
     "export_image_to_drive",
+    "resolve_export_region",
+    "TaskQueue",
+    "fetch_once",
     "date_to_ee_date",
     "add_timestamp_band",
     "replace_masked_values",
     "clip_to_region",
     "get_image_stats",
+    "init_highvolume",
+    "get_image_stats_parallel",
+    "download_images_parallel",
     "create_ee_polygon_from_bounds",
     "apply_scale_factors",
+    "save_index",
+    "save_index_zarr",
 ]
@@ -0,0 +1,8 @@
+# Optional Numba JIT shared by the local array kernels. Modules check `njit is None`
+# and define a plain NumPy kernel instead. Kernels must not use np.linalg, which
+# Numba only supports with SciPy installed.
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+    prange = range
@@ -1,12 +1,58 @@
 import ee
-from typing import List, Dict
-from .regression_model import apply_regression_model, calculate_residuals
+import numpy as np
+from typing import List, Dict, Tuple
+from .regression_model import apply_regression_model, apply_regression_and_residuals
+from ._jit import njit, prange
+
+
+if njit is not None:
+
+    @njit(parallel=True, cache=True)
+    def _add_arrays(predicted: np.ndarray, residuals: np.ndarray) -> np.ndarray:
+        out = np.empty_like(predicted)
+        for i in prange(predicted.shape[0]):
+            for j in range(predicted.shape[1]):
+                out[i, j] = predicted[i, j] + residuals[i, j]
+        return out
+
+else:
+
+    def _add_arrays(predicted: np.ndarray, residuals: np.ndarray) -> np.ndarray:
+        return predicted + residuals
+
+
+def _downscaling_components(
+    sentinel_image: ee.Image,
+    landsat_image: ee.Image,
+    regression_coefficients: Dict[str, float],
+    independent_vars: List[str],
+) -> Tuple[ee.Image, ee.Image]:
+    """
+    Builds the Sentinel-2 predicted LST and the bilinearly resampled Landsat residuals.
+    """
+    # Apply regression model to Sentinel-2 image
+    sentinel_predicted_lst = apply_regression_model(
+        sentinel_image, regression_coefficients, independent_vars
+    )
+
+    # Calculate residuals from Landsat
+    landsat_residuals = apply_regression_and_residuals(
+        landsat_image, regression_coefficients, independent_vars
+    )
+
+    # Resample Landsat residuals bilinearly. No explicit reproject: the residuals
+    # are resampled on request into the output's Sentinel-2 projection.
+    resampled_residuals = landsat_residuals.select("LST_residuals").resample(
+        "bilinear"
+    )
+
+    return sentinel_predicted_lst.select("LST_predicted"), resampled_residuals
 
 
 def downscale_lst(
     sentinel_image: ee.Image,
     landsat_image: ee.Image,
-    regression_coefficients: Dict[str, ee.Number],
+    regression_coefficients: Dict[str, float],
     independent_vars: List[str],
 ) -> ee.Image:
     """
@@ -15,34 +61,71 @@ def downscale_lst(
     Args:
         sentinel_image (ee.Image): Sentinel-2 image with spectral indices.
         landsat_image (ee.Image): Landsat image with LST and spectral indices.
-        regression_coefficients (Dict[str, ee.Number]): Ridge regression coefficients and intercept.
+        regression_coefficients (Dict[str, float]): Ridge regression coefficients and intercept.
         independent_vars (List[str]): List of independent variable band names.
 
     Returns:
         ee.Image: Downscaled LST image at Sentinel-2 resolution.
     """
-    # Apply regression model to Sentinel-2 image
-    sentinel_predicted_lst = apply_regression_model(
-        sentinel_image, regression_coefficients, independent_vars
-    )
+    # Resolve the 10 m Sentinel-2 grid once; the full image mixes 10/20/60 m bands
+    sentinel_projection = sentinel_image.select("B4").projection()
 
-    # Calculate residuals from Landsat
-    landsat_residuals = calculate_residuals(
-        apply_regression_model(landsat_image, regression_coefficients, independent_vars)
-    )
-
-    # Resample Landsat residuals to Sentinel-2 resolution
-    resampled_residuals = (
-        landsat_residuals.select("LST_residuals")
-        .resample("bilinear")
-        .reproject(crs=sentinel_image.projection(), scale=10)
+    predicted_lst, resampled_residuals = _downscaling_components(
+        sentinel_image, landsat_image, regression_coefficients, independent_vars
     )
 
     # Add resampled residuals to Sentinel-2 predicted LST
     downscaled_lst = (
-        sentinel_predicted_lst.select("LST_predicted")
-        .add(resampled_residuals)
+        predicted_lst.add(resampled_residuals)
         .rename("LST_downscaled")
+        .setDefaultProjection(sentinel_projection)
     )
 
     return sentinel_image.addBands(downscaled_lst)
+
+
+def downscale_lst_local(
+    sentinel_image: ee.Image,
+    landsat_image: ee.Image,
+    regression_coefficients: Dict[str, float],
+    independent_vars: List[str],
+    region: ee.Geometry,
+    scale: float = 10,
+) -> np.ndarray:
+    """
+    Downscales Landsat LST for a small region and returns it as a local array.
+
+    The predicted LST and the resampled residuals are downloaded together in a single
+    ee.data.computePixels request and summed on the client, in parallel with Numba if
+    it is installed.
+
+    Args:
+        sentinel_image (ee.Image): Sentinel-2 image with spectral indices.
+        landsat_image (ee.Image): Landsat image with LST and spectral indices.
+        regression_coefficients (Dict[str, float]): Ridge regression coefficients and intercept.
+        independent_vars (List[str]): List of independent variable band names.
+        region (ee.Geometry): Region to download. Must fit within the computePixels size limits.
+        scale (float): Output pixel size in meters. Default is 10 (Sentinel-2 resolution).
+
+    Returns:
+        np.ndarray: 2-D float32 array of downscaled LST.
+    """
+    sentinel_projection = sentinel_image.select("B4").projection()
+
+    predicted_lst, resampled_residuals = _downscaling_components(
+        sentinel_image, landsat_image, regression_coefficients, independent_vars
+    )
+    components = (
+        predicted_lst.addBands(resampled_residuals)
+        .setDefaultProjection(sentinel_projection)
+        .clipToBoundsAndScale(geometry=region, scale=scale)
+    )
+
+    pixels = ee.data.computePixels(
+        {"expression": components, "fileFormat": "NUMPY_NDARRAY"}
+    )
+
+    return _add_arrays(
+        pixels["LST_predicted"].astype(np.float32),
+        pixels["LST_residuals"].astype(np.float32),
+    )
@@ -1,4 +1,17 @@
+import os
 import ee
+from .utils import fetch_once
+
+
+# Band name of the placeholder image returned when no image matches the filters
+EMPTY_BAND = "__empty__"
+
+
+def _debug_enabled() -> bool:
+    """
+    Returns True if Earth Engine debug output is enabled via the DEBUG_EE environment variable.
+    """
+    return bool(os.environ.get("DEBUG_EE"))
 
 
 def get_landsat_collection(
@@ -18,10 +31,19 @@ def get_landsat_collection(
         .filter(ee.Filter.lt("CLOUD_COVER", cloud_cover))
     )
 
-    # Print debug information
-    print(f"Landsat collection size: {landsat_collection.size().getInfo()}")
-    if landsat_collection.size().getInfo() > 0:
-        print(f"First image ID: {landsat_collection.first().id().getInfo()}")
+    # Print debug information in a single request, only when DEBUG_EE is set
+    if _debug_enabled():
+        info = fetch_once(
+            {
+                "size": landsat_collection.size(),
+                "first_id": ee.Algorithms.If(
+                    landsat_collection.size().gt(0), landsat_collection.first().id()
+                ),
+            }
+        )
+        print(f"Landsat collection size: {info['size']}")
+        if info["size"] > 0:
+            print(f"First image ID: {info['first_id']}")
 
     return landsat_collection
 
@@ -61,45 +83,64 @@ def apply_scale_factors(image: ee.Image) -> ee.Image:
     Returns:
         ee.Image: Landsat image with scale factors applied.
     """
-    optical_bands = image.select("SR_B.*").multiply(0.0000275).add(-0.2)
-    thermal_bands = (
-        image.select("ST_B.*").multiply(0.00341802).add(149.0).subtract(273.15)
+    # One fused expression per band group; the thermal offset 149.0 - 273.15 is
+    # folded into a single constant so the result is in degrees Celsius.
+    optical_bands = image.expression(
+        "b * 0.0000275 - 0.2", {"b": image.select("SR_B.*")}
+    )
+    thermal_bands = image.expression(
+        "b * 0.00341802 - 124.15", {"b": image.select("ST_B.*")}
     )
-    return image.addBands(optical_bands, None, True).addBands(thermal_bands, None, True)
+    return image.addBands(ee.Image.cat([optical_bands, thermal_bands]), None, True)
 
 
-def get_single_landsat_image(collection: ee.ImageCollection, start_date: str, end_date: str) -> ee.Image:
+def get_single_landsat_image(
+    collection: ee.ImageCollection,
+    start_date: str,
+    end_date: str,
+    verbose: bool = False,
+) -> ee.Image:
     """
     Retrieves a single Landsat image from a collection based on the given date range.
+
+    The image is built lazily; Earth Engine is only queried when ``verbose`` or the
+    DEBUG_EE environment variable is set. If no image matches, a placeholder image
+    with a single EMPTY_BAND band is returned.
     """
-    try:
-        filtered_collection = collection.filterDate(start_date, end_date)
-        image_count = filtered_collection.size().getInfo()
-        print(f"Number of images found for date range {start_date} to {end_date}: {image_count}")
-
-        if image_count == 0:
-            print(f"No Landsat images found for date range: {start_date} to {end_date}")
-            return None
-
-        # Sort the collection by cloud cover and get the least cloudy image
-        image = ee.Image(filtered_collection.sort('CLOUD_COVER').first())
-        
-        # Check if the image has bands
-        band_names = image.bandNames().getInfo()
-        if not band_names:
-            print(f"Retrieved Landsat image has no bands for date range: {start_date} to {end_date}")
-            return None
-
-        image_date = ee.Date(image.get('system:time_start')).format('YYYY-MM-dd').getInfo()
-        print(f"Retrieved Landsat image date: {image_date}")
-        print(f"Retrieved Landsat image bands: {band_names}")
-        return image
-    except Exception as e:
-        print(f"Error retrieving Landsat image: {str(e)}")
-        return None
-
-
-def get_single_sentinel2_image(collection: ee.ImageCollection, start_date: str, end_date: str) -> ee.Image:
+    filtered_collection = collection.filterDate(start_date, end_date)
+
+    # Sort the collection by cloud cover and get the least cloudy image. If the
+    # collection is empty, a placeholder with only the EMPTY_BAND band is returned.
+    image = ee.Image(
+        ee.Algorithms.If(
+            filtered_collection.size().gt(0),
+            filtered_collection.sort('CLOUD_COVER').first(),
+            ee.Image.constant(0).rename(EMPTY_BAND),
+        )
+    )
+
+    if verbose or _debug_enabled():
+        try:
+            info = fetch_once({
+                'count': filtered_collection.size(),
+                'date': ee.Date(image.get('system:time_start')).format('YYYY-MM-dd'),
+                'bands': image.bandNames(),
+            })
+            print(f"Number of images found for date range {start_date} to {end_date}: {info['count']}")
+            print(f"Retrieved Landsat image date: {info['date']}")
+            print(f"Retrieved Landsat image bands: {info['bands']}")
+        except ee.EEException as e:
+            print(f"Error retrieving Landsat image: {str(e)}")
+
+    return image
+
+
+def get_single_sentinel2_image(
+    collection: ee.ImageCollection,
+    start_date: str,
+    end_date: str,
+    verbose: bool = False,
+) -> ee.Image:
     """
     Retrieves a single Sentinel-2 image from a collection based on the given date range.
 
@@ -107,32 +148,34 @@ def get_single_sentinel2_image(collection: ee.ImageCollection, start_date: str,
         collection (ee.ImageCollection): Sentinel-2 image collection.
         start_date (str): Start date for filtering (YYYY-MM-DD).
         end_date (str): End date for filtering (YYYY-MM-DD).
+        verbose (bool): Print the image count, date and bands. Costs one round-trip to Earth Engine. Also enabled by the DEBUG_EE environment variable. Default is False.
 
     Returns:
-        ee.Image: Single Sentinel-2 image.
+        ee.Image: Single Sentinel-2 image, or a placeholder with a single EMPTY_BAND band if none matches.
     """
-    try:
-        filtered_collection = collection.filterDate(start_date, end_date)
-        image_count = filtered_collection.size().getInfo()
-        print(f"Number of Sentinel-2 images found for date range {start_date} to {end_date}: {image_count}")
-
-        if image_count == 0:
-            print(f"No Sentinel-2 images found for date range: {start_date} to {end_date}")
-            return None
-
-        # Sort the collection by cloud cover and get the least cloudy image
-        image = ee.Image(filtered_collection.sort('CLOUDY_PIXEL_PERCENTAGE').first())
-        
-        # Check if the image has bands
-        band_names = image.bandNames().getInfo()
-        if not band_names:
-            print(f"Retrieved Sentinel-2 image has no bands for date range: {start_date} to {end_date}")
-            return None
-
-        image_date = ee.Date(image.get('system:time_start')).format('YYYY-MM-dd').getInfo()
-        print(f"Retrieved Sentinel-2 image date: {image_date}")
-        print(f"Retrieved Sentinel-2 image bands: {band_names}")
-        return image
-    except Exception as e:
-        print(f"Error retrieving Sentinel-2 image: {str(e)}")
-        return None
+    filtered_collection = collection.filterDate(start_date, end_date)
+
+    # Sort the collection by cloud cover and get the least cloudy image. If the
+    # collection is empty, a placeholder with only the EMPTY_BAND band is returned.
+    image = ee.Image(
+        ee.Algorithms.If(
+            filtered_collection.size().gt(0),
+            filtered_collection.sort('CLOUDY_PIXEL_PERCENTAGE').first(),
+            ee.Image.constant(0).rename(EMPTY_BAND),
+        )
+    )
+
+    if verbose or _debug_enabled():
+        try:
+            info = fetch_once({
+                'count': filtered_collection.size(),
+                'date': ee.Date(image.get('system:time_start')).format('YYYY-MM-dd'),
+                'bands': image.bandNames(),
+            })
+            print(f"Number of Sentinel-2 images found for date range {start_date} to {end_date}: {info['count']}")
+            print(f"Retrieved Sentinel-2 image date: {info['date']}")
+            print(f"Retrieved Sentinel-2 image bands: {info['bands']}")
+        except ee.EEException as e:
+            print(f"Error retrieving Sentinel-2 image: {str(e)}")
+
+    return image
@@ -1,6 +1,145 @@
 import ee
+import hashlib
+import json
+import os
+import re
+import tempfile
+import numpy as np
+import pandas as pd
+from pathlib import Path
 from typing import List, Dict
 
+# Fits with at most this many samples are solved locally instead of on Earth Engine
+LOCAL_SOLVE_MAX_SAMPLES = 10000
+
+# Directory where downloaded regression samples are kept between sessions
+SAMPLE_CACHE_DIR = Path(
+    os.environ.get(
+        "LST_SAMPLE_CACHE_DIR", Path.home() / ".cache" / "lst_downscaling" / "samples"
+    )
+)
+
+
+def _ridge_solve(X: np.ndarray, y: np.ndarray, lambda_: float) -> np.ndarray:
+    """
+    Solves the ridge normal equations (XᵀX + λI)β = Xᵀy.
+
+    The last column of X is the intercept column and is not penalised. The system is
+    only (numX + 1) x (numX + 1), so np.linalg.solve (LAPACK) is used as is.
+    """
+    xtx = X.T @ X
+    penalty = lambda_ * np.eye(xtx.shape[0])
+    penalty[-1, -1] = 0.0
+    return np.linalg.solve(xtx + penalty, X.T @ y)
+
+
+def _sample_cache_path(
+    cache_key: str,
+    region: ee.Geometry,
+    selectors: List[str],
+    scale: float,
+    num_samples: int,
+) -> Path:
+    """
+    Builds the Parquet cache path for a scene and its sampling parameters.
+    """
+    digest = hashlib.sha1(
+        json.dumps([region.serialize(), selectors, scale, num_samples]).encode()
+    ).hexdigest()[:16]
+    scene = re.sub(r"[^A-Za-z0-9_.-]", "_", cache_key)
+    return SAMPLE_CACHE_DIR / f"{scene}-{digest}.parquet"
+
+
+def _download_samples(
+    samples: ee.FeatureCollection, selectors: List[str], cache_path: Path = None
+) -> pd.DataFrame:
+    """
+    Downloads sampled values as float32 columns, reusing a cached Parquet copy.
+
+    Args:
+        samples (ee.FeatureCollection): Sampled points.
+        selectors (List[str]): Properties to download.
+        cache_path (Path, optional): Parquet file to read from and write to. Defaults to no caching.
+
+    Returns:
+        pd.DataFrame: Sampled values, one column per selector.
+    """
+    if cache_path is not None and cache_path.exists():
+        try:
+            return pd.read_parquet(cache_path)
+        except ImportError:  # No Parquet engine installed; keep the file
+            pass
+        except PermissionError:  # Not readable by this process; keep the file
+            pass
+        except (OSError, ValueError):
+            # Truncated or corrupt file (pyarrow.ArrowInvalid is a ValueError);
+            # drop it and download again
+            cache_path.unlink(missing_ok=True)
+
+    samples_url = samples.getDownloadURL(filetype="csv", selectors=selectors)
+    df = pd.read_csv(samples_url).astype(np.float32)
+
+    if cache_path is not None:
+        _write_cache(df, cache_path)
+
+    return df
+
+
+def _write_cache(df: pd.DataFrame, cache_path: Path) -> None:
+    """
+    Writes samples to the Parquet cache atomically.
+
+    The file is written under a temporary name in the same directory and then renamed
+    into place, so readers never see a partially written file, even when sessions
+    fitting the same scene write concurrently.
+    """
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(
+        dir=cache_path.parent, prefix=f".{cache_path.name}.", suffix=".tmp"
+    )
+    os.close(fd)
+    try:
+        df.to_parquet(tmp_name, index=False)
+        os.replace(tmp_name, cache_path)
+    except ImportError:  # No Parquet engine installed; skip the cache
+        pass
+    finally:
+        if os.path.exists(tmp_name):
+            os.remove(tmp_name)
+
+
+def _fit_ridge_locally(
+    samples: pd.DataFrame,
+    dependent_var: str,
+    independent_vars: List[str],
+    lambda_: float,
+) -> Dict[str, float]:
+    """
+    Fits the ridge regression on downloaded samples.
+
+    Args:
+        samples (pd.DataFrame): Sampled pixel values, one column per band.
+        dependent_var (str): Name of the dependent variable column.
+        independent_vars (List[str]): Names of the independent variable columns.
+        lambda_ (float): Ridge regression regularization parameter.
+
+    Returns:
+        Dict[str, float]: Dictionary containing regression coefficients and intercept.
+    """
+    samples = samples.dropna()
+    if samples.empty:
+        raise ValueError("No valid samples found for the regression model.")
+
+    X = np.column_stack(
+        [samples[independent_vars].to_numpy(np.float64), np.ones(len(samples))]
+    )
+    y = samples[dependent_var].to_numpy(np.float64)
+    beta = _ridge_solve(X, y, lambda_)
+
+    coeff_dict = {var: float(beta[i]) for i, var in enumerate(independent_vars)}
+    coeff_dict["intercept"] = float(beta[-1])
+    return coeff_dict
+
 
 def create_ridge_regression_model(
     landsat_image: ee.Image,
@@ -10,10 +149,16 @@ def create_ridge_regression_model(
     scale: float = 30,
     lambda_: float = 0.1,
     num_samples: int = 5000,
-) -> Dict[str, ee.Number]:
+    cache_key: str = None,
+) -> Dict[str, float]:
     """
     Creates a ridge regression model using Landsat data.
 
+    Up to LOCAL_SOLVE_MAX_SAMPLES samples are downloaded and the model is solved
+    locally; larger fits use ee.Reducer.ridgeRegression.
+    When a cache_key is given, downloaded samples are stored as Parquet in
+    SAMPLE_CACHE_DIR (LST_SAMPLE_CACHE_DIR) and reused by later fits.
+
     Args:
         landsat_image (ee.Image): Input Landsat image with LST and spectral indices.
         dependent_var (str): Name of the dependent variable band (e.g., 'LST').
@@ -22,15 +167,39 @@ def create_ridge_regression_model(
         scale (float): Scale in meters for sampling points. Default is 30 (Landsat resolution).
         lambda_ (float): Ridge regression regularization parameter. Default is 0.1.
         num_samples (int): Number of random points to sample. Default is 5000.
+        cache_key (str, optional): Identifier of the image, e.g. its system:id, used to cache samples locally. Default is None (no caching).
 
     Returns:
-        Dict[str, ee.Number]: Dictionary containing regression coefficients and intercept.
+        Dict[str, float]: Dictionary containing regression coefficients and intercept.
     """
     # Create an image with the independent and dependent variables
     regression_image = landsat_image.select(independent_vars + [dependent_var])
 
-    # Sample the image
-    samples = regression_image.sample(region=region, scale=scale, numPixels=num_samples)
+    # Sample the image. A higher tileScale splits the sampling into smaller
+    # tiles that Earth Engine can process in parallel.
+    samples = regression_image.sample(
+        region=region,
+        scale=scale,
+        numPixels=num_samples,
+        seed=42,
+        tileScale=4,
+        geometries=False,
+    )
+
+    # Small fits are faster to solve locally than with a server-side reducer
+    if num_samples <= LOCAL_SOLVE_MAX_SAMPLES:
+        selectors = independent_vars + [dependent_var]
+        cache_path = None
+        if cache_key is not None:
+            cache_path = _sample_cache_path(
+                cache_key, region, selectors, scale, num_samples
+            )
+        return _fit_ridge_locally(
+            _download_samples(samples, selectors, cache_path),
+            dependent_var,
+            independent_vars,
+            lambda_,
+        )
 
     # Perform ridge regression
     regression = samples.reduceColumns(
@@ -42,40 +211,79 @@ def create_ridge_regression_model(
         }
     )
 
-    # Extract coefficients and intercept
-    coefficients = ee.Array(regression.get("coefficients")).toList()
+    # Name the coefficients server-side and resolve them in a single request.
+    # The coefficients array is (numX + 1, 1) with the intercept in the last row.
+    coefficients = ee.Dictionary.fromLists(
+        independent_vars + ["intercept"],
+        ee.Array(regression.get("coefficients")).toList().flatten(),
+    ).getInfo()
 
-    # Create a dictionary with named coefficients
-    coeff_dict = {var: coefficients.get(i) for i, var in enumerate(independent_vars)}
-    coeff_dict["intercept"] = coefficients.get(
-        -1
-    )  # The last coefficient is the intercept
-
-    return coeff_dict
+    return {name: float(value) for name, value in coefficients.items()}
 
 
 def apply_regression_model(
-    image: ee.Image, coefficients: Dict[str, ee.Number], independent_vars: List[str]
+    image: ee.Image,
+    coefficients: Dict[str, float],
+    independent_vars: List[str],
 ) -> ee.Image:
     """
     Applies the ridge regression model to an image.
 
     Args:
         image (ee.Image): Input image with spectral indices.
-        coefficients (Dict[str, ee.Number]): Regression coefficients and intercept.
+        coefficients (Dict[str, float]): Regression coefficients and intercept.
         independent_vars (List[str]): List of independent variable band names.
 
     Returns:
         ee.Image: Image with predicted LST band added.
     """
-    # Create an image of the intercept
-    prediction = ee.Image.constant(coefficients["intercept"])
+    prediction = _predict(image, coefficients, independent_vars)
+    return image.addBands(prediction.rename("LST_predicted"))
 
-    # Add the weighted independent variables
-    for var in independent_vars:
-        prediction = prediction.add(image.select(var).multiply(coefficients[var]))
 
-    return image.addBands(prediction.rename("LST_predicted"))
+def apply_regression_and_residuals(
+    image: ee.Image,
+    coefficients: Dict[str, float],
+    independent_vars: List[str],
+) -> ee.Image:
+    """
+    Applies the ridge regression model and calculates the residuals in one step.
+
+    Equivalent to calculate_residuals(apply_regression_model(...)), but the
+    residuals reuse the prediction directly instead of re-selecting it.
+
+    Args:
+        image (ee.Image): Input image with observed LST and spectral indices.
+        coefficients (Dict[str, float]): Regression coefficients and intercept.
+        independent_vars (List[str]): List of independent variable band names.
+
+    Returns:
+        ee.Image: Image with predicted LST and residuals bands added.
+    """
+    prediction = _predict(image, coefficients, independent_vars)
+    residuals = image.select("LST").subtract(prediction)
+
+    return image.addBands(
+        ee.Image.cat([prediction, residuals]).rename(["LST_predicted", "LST_residuals"])
+    )
+
+
+def _predict(
+    image: ee.Image, coefficients: Dict[str, float], independent_vars: List[str]
+) -> ee.Image:
+    """
+    Builds the single-band regression prediction for an image.
+    """
+    # Weight all independent variables at once and sum them across bands
+    coefficient_image = ee.Image.constant(
+        [coefficients[var] for var in independent_vars]
+    )
+    return (
+        image.select(independent_vars)
+        .multiply(coefficient_image)
+        .reduce(ee.Reducer.sum())
+        .add(ee.Image.constant(coefficients["intercept"]))
+    )
 
 
 def calculate_residuals(image: ee.Image) -> ee.Image:
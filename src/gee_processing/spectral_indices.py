@@ -1,42 +1,96 @@
 import ee
-from typing import Dict, Callable
+import numpy as np
+from typing import Callable, NamedTuple, Tuple
+from ._jit import njit, prange
+
+try:
+    from ._indices import fuse as _cython_fused_indices
+except ImportError:  # The Cython kernel is optional and built separately
+    _cython_fused_indices = None
+
+try:
+    from ml_dtypes import bfloat16
+except ImportError:  # ml_dtypes is optional; only needed for dtype="bf16"
+    bfloat16 = None
+
+
+class Bands(NamedTuple):
+    """
+    Band names of the inputs to the spectral indices for one sensor.
+    """
+
+    nir: str
+    red: str
+    swir1: str
+    green: str
+
 
 # Define band mappings for different sensors.
 # Source: https://developers.google.com/earth-engine/datasets/catalog/landsat-8
 # Source: https://developers.google.com/earth-engine/datasets/catalog/sentinel-2
 BAND_MAPPINGS = {
-    "landsat": {"nir": "SR_B5", "red": "SR_B4", "swir1": "SR_B6", "green": "SR_B3"},
-    "sentinel2": {"nir": "B8", "red": "B4", "swir1": "B11", "green": "B3"},
+    "landsat": Bands(nir="SR_B5", red="SR_B4", swir1="SR_B6", green="SR_B3"),
+    "sentinel2": Bands(nir="B8", red="B4", swir1="B11", green="B3"),
 }
 
+# Added to the denominators of local indices to avoid division by zero
+_EPSILON = 1e-6
 
-def create_index_function(
-    index_name: str, band1: str, band2: str
-) -> Callable[[ee.Image, Dict[str, str]], ee.Image]:
+
+def _nd(a: ee.Image, b: ee.Image) -> ee.Image:
+    """
+    Computes the normalized difference (a - b) / (a + b).
     """
-    Creates a function to calculate a specific spectral index.
+    return a.subtract(b).divide(a.add(b))
 
-    Args:
-        index_name (str): Name of the index (e.g., 'NDVI').
-        band1 (str): Key for the first band in BAND_MAPPINGS.
-        band2 (str): Key for the second band in BAND_MAPPINGS.
 
-    Returns:
-        Callable: Function that calculates the index for a given image and band mapping.
+def _make_index_function(bands: Bands) -> Callable[[ee.Image], ee.Image]:
     """
+    Builds an index function specialized to one sensor's band names.
+
+    The band names are bound as default arguments, so the returned function reads them
+    as locals instead of looking them up on every call.
+    """
+
+    def add_indices(
+        image: ee.Image,
+        nir_band: str = bands.nir,
+        red_band: str = bands.red,
+        swir1_band: str = bands.swir1,
+        green_band: str = bands.green,
+    ) -> ee.Image:
+        # Select each band once; NIR is shared by all three indices
+        nir = image.select(nir_band).toFloat()
+        red = image.select(red_band).toFloat()
+        swir1 = image.select(swir1_band).toFloat()
+        green = image.select(green_band).toFloat()
 
-    def calculate_index(image: ee.Image, band_mapping: Dict[str, str]) -> ee.Image:
-        return image.normalizedDifference(
-            [band_mapping[band1], band_mapping[band2]]
-        ).rename(index_name)
+        indices = ee.Image.cat(
+            [_nd(nir, red), _nd(swir1, nir), _nd(green, nir)]
+        ).rename(["NDVI", "NDBI", "NDWI"])
 
-    return calculate_index
+        return image.addBands(indices)
 
+    return add_indices
 
-# Create index calculation functions
-calculate_ndvi = create_index_function("NDVI", "nir", "red")
-calculate_ndbi = create_index_function("NDBI", "swir1", "nir")
-calculate_ndwi = create_index_function("NDWI", "green", "nir")
+
+calculate_indices_landsat = _make_index_function(BAND_MAPPINGS["landsat"])
+calculate_indices_sentinel2 = _make_index_function(BAND_MAPPINGS["sentinel2"])
+
+_INDEX_FUNCTIONS = {
+    "landsat": calculate_indices_landsat,
+    "sentinel2": calculate_indices_sentinel2,
+}
+
+
+def _get_index_function(sensor: str) -> Callable[[ee.Image], ee.Image]:
+    """
+    Looks up the specialized index function for a sensor, rejecting unknown sensors.
+    """
+    try:
+        return _INDEX_FUNCTIONS[sensor.lower()]
+    except KeyError:
+        raise ValueError("Sensor must be either 'landsat' or 'sentinel2'") from None
 
 
 def calculate_indices(image: ee.Image, sensor: str) -> ee.Image:
@@ -50,13 +104,7 @@ def calculate_indices(image: ee.Image, sensor: str) -> ee.Image:
     Returns:
         ee.Image: Input image with added NDVI, NDBI, and NDWI bands.
     """
-    band_mapping = BAND_MAPPINGS[sensor.lower()]
-
-    ndvi = calculate_ndvi(image, band_mapping)
-    ndbi = calculate_ndbi(image, band_mapping)
-    ndwi = calculate_ndwi(image, band_mapping)
-
-    return image.addBands([ndvi, ndbi, ndwi])
+    return _get_index_function(sensor)(image)
 
 
 def add_indices_to_collection(
@@ -72,7 +120,82 @@ def add_indices_to_collection(
     Returns:
         ee.ImageCollection: Image collection with added index bands.
     """
-    if sensor.lower() not in BAND_MAPPINGS:
-        raise ValueError("Sensor must be either 'landsat' or 'sentinel2'")
+    # Resolve the sensor once and map its specialized function directly
+    index_function = _get_index_function(sensor)
+
+    return collection.map(index_function)
+
+
+# Prefer the compiled Cython kernel, then Numba, then plain NumPy
+if _cython_fused_indices is not None:
+    _fused_indices = _cython_fused_indices
+
+elif njit is not None:
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _fused_indices(nir, red, swir1, green, out_ndvi, out_ndbi, out_ndwi):
+        for i in prange(nir.shape[0]):
+            for j in range(nir.shape[1]):
+                n = nir[i, j]
+                r = red[i, j]
+                s = swir1[i, j]
+                g = green[i, j]
+                out_ndvi[i, j] = (n - r) / (n + r + _EPSILON)
+                out_ndbi[i, j] = (s - n) / (s + n + _EPSILON)
+                out_ndwi[i, j] = (g - n) / (g + n + _EPSILON)
+
+else:
 
-    return collection.map(lambda img: calculate_indices(img, sensor))
+    def _fused_indices(nir, red, swir1, green, out_ndvi, out_ndbi, out_ndwi):
+        np.divide(nir - red, nir + red + _EPSILON, out=out_ndvi)
+        np.divide(swir1 - nir, swir1 + nir + _EPSILON, out=out_ndbi)
+        np.divide(green - nir, green + nir + _EPSILON, out=out_ndwi)
+
+
+def local_indices(
+    nir: np.ndarray,
+    red: np.ndarray,
+    swir1: np.ndarray,
+    green: np.ndarray,
+    dtype: str = "float32",
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Calculates NDVI, NDBI, and NDWI on local 2-D band arrays.
+
+    Use this when the bands are already downloaded (e.g. with ee.data.computePixels)
+    instead of computing the indices on Earth Engine. With the Cython kernel
+    (_indices.pyx) built or Numba installed, all three indices are computed in one
+    parallel pass that reads each band once.
+
+    Args:
+        nir (np.ndarray): Near-infrared band.
+        red (np.ndarray): Red band.
+        swir1 (np.ndarray): Shortwave infrared 1 band.
+        green (np.ndarray): Green band.
+        dtype (str): Output type, either 'float32' or 'bf16'. 'bf16' halves the size of
+            the outputs and requires the ml_dtypes package. Default is 'float32'.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: NDVI, NDBI, and NDWI arrays.
+    """
+    if dtype not in ("float32", "bf16"):
+        raise ValueError("dtype must be either 'float32' or 'bf16'")
+    if dtype == "bf16" and bfloat16 is None:
+        raise ImportError("dtype='bf16' requires the ml_dtypes package")
+
+    # Cast once at entry; the indices lie in [-1, 1] and need no float64 precision
+    nir, red, swir1, green = (
+        np.ascontiguousarray(band, dtype=np.float32)
+        for band in (nir, red, swir1, green)
+    )
+
+    ndvi = np.empty(nir.shape, dtype=np.float32)
+    ndbi = np.empty(nir.shape, dtype=np.float32)
+    ndwi = np.empty(nir.shape, dtype=np.float32)
+    _fused_indices(nir, red, swir1, green, ndvi, ndbi, ndwi)
+
+    if dtype == "bf16":
+        # Computed with float32 precision, rounded to bfloat16 only on output
+        return ndvi.astype(bfloat16), ndbi.astype(bfloat16), ndwi.astype(bfloat16)
+
+    return ndvi, ndbi, ndwi
@@ -1,6 +1,47 @@
 import ee
 from typing import Union, List, Dict, Any
+import collections
 import datetime
+import os
+import threading
+import numpy as np
+
+# Earth Engine endpoint for large numbers of concurrent automated requests
+HIGH_VOLUME_URL = "https://earthengine-highvolume.googleapis.com"
+
+# No-data value written to local index rasters in place of NaN
+INDEX_NODATA = -9999
+
+# Export footprints shared between images, keyed by a caller-supplied cache key
+_geom_cache: Dict[str, ee.Geometry] = {}
+
+
+def resolve_export_region(
+    image: ee.Image, region: ee.Geometry = None, cache_key: str = None
+) -> ee.Geometry:
+    """
+    Resolves the region to export, reusing cached image footprints.
+
+    Images derived from the same scene (e.g. one per spectral index) share a
+    footprint, so passing the same cache_key for them computes the geometry once.
+    The key is supplied by the caller rather than read from system:id, which would
+    cost a getInfo() round-trip per export.
+
+    Args:
+        image (ee.Image): The image to export.
+        region (ee.Geometry, optional): An explicit region. Returned unchanged if given.
+        cache_key (str, optional): Key under which the image's geometry is cached. Defaults to no caching.
+
+    Returns:
+        ee.Geometry: The region to export.
+    """
+    if region is not None:
+        return region
+    if cache_key is None:
+        return image.geometry()
+    if cache_key not in _geom_cache:
+        _geom_cache[cache_key] = image.geometry()
+    return _geom_cache[cache_key]
 
 
 def export_image_to_asset(
@@ -10,7 +51,9 @@ def export_image_to_asset(
     scale: int = 30,
     crs: str = "EPSG:4326",
     region: ee.Geometry = None,
-    max_pixels: int = 1e13,
+    max_pixels: int = 10_000_000_000_000,
+    cache_key: str = None,
+    queue: "TaskQueue" = None,
 ) -> ee.batch.Task:
     """
     Exports an Earth Engine image to an asset.
@@ -23,12 +66,13 @@ def export_image_to_asset(
         crs (str, optional): The coordinate reference system. Defaults to "EPSG:4326".
         region (ee.Geometry, optional): The region to export. Defaults to the image's geometry.
         max_pixels (int, optional): The maximum number of pixels to export. Defaults to 1e13.
+        cache_key (str, optional): Key for reusing the image's geometry across exports. Defaults to None.
+        queue (TaskQueue, optional): Queue that starts the task once quota allows. Defaults to starting it immediately.
 
     Returns:
         ee.batch.Task: The export task.
     """
-    if region is None:
-        region = image.geometry()
+    region = resolve_export_region(image, region, cache_key)
 
     task = ee.batch.Export.image.toAsset(
         image=image,
@@ -39,7 +83,10 @@ def export_image_to_asset(
         region=region,
         maxPixels=max_pixels,
     )
-    task.start()
+    if queue is None:
+        task.start()
+    else:
+        queue.enqueue(task)
     return task
 
 
@@ -51,8 +98,10 @@ def export_image_to_drive(
     scale: int = 30,
     crs: str = "EPSG:4326",
     region: ee.Geometry = None,
-    max_pixels: int = 1e13,
+    max_pixels: int = 10_000_000_000_000,
     file_format: str = "GeoTIFF",
+    cache_key: str = None,
+    queue: "TaskQueue" = None,
 ) -> ee.batch.Task:
     """
     Exports an Earth Engine image to Google Drive.
@@ -67,12 +116,13 @@ def export_image_to_drive(
         region (ee.Geometry, optional): The region to export. Defaults to the image's geometry.
         max_pixels (int, optional): The maximum number of pixels to export. Defaults to 1e13.
         file_format (str, optional): The output file format. Defaults to "GeoTIFF".
+        cache_key (str, optional): Key for reusing the image's geometry across exports. Defaults to None.
+        queue (TaskQueue, optional): Queue that starts the task once quota allows. Defaults to starting it immediately.
 
     Returns:
         ee.batch.Task: The export task.
     """
-    if region is None:
-        region = image.geometry()
+    region = resolve_export_region(image, region, cache_key)
 
     task = ee.batch.Export.image.toDrive(
         image=image,
@@ -85,10 +135,204 @@ def export_image_to_drive(
         maxPixels=max_pixels,
         fileFormat=file_format,
     )
-    task.start()
+    if queue is None:
+        task.start()
+    else:
+        queue.enqueue(task)
     return task
 
 
+# Substrings of task.start() errors caused by quota or rate limits rather than by
+# the task itself; such tasks are re-queued instead of marked as failed
+_RETRYABLE_START_ERRORS = (
+    "quota",
+    "rate limit",
+    "too many tasks",
+    "too many requests",
+    "resource exhausted",
+)
+
+
+class TaskQueue:
+    """
+    Starts export tasks in bursts that stay within the Earth Engine task quota.
+
+    Earth Engine limits how many tasks an account may have queued or running. Instead
+    of starting every export at once, queued tasks are started by a background thread
+    which checks the number of active operations once per poll interval and starts
+    only as many tasks as there are free slots.
+
+    Errors while checking the quota or starting a task (e.g. a dropped connection)
+    are recorded in `errors` and retried on the next poll; after `max_errors`
+    consecutive failed polls the queue stops. Tasks rejected for quota or rate limits
+    are re-queued; tasks that Earth Engine rejects otherwise are moved to `failed` as
+    (task, exception) pairs and not retried.
+
+    Args:
+        max_concurrent (int, optional): Maximum number of active tasks. Defaults to 2000.
+        poll_interval (float, optional): Seconds between quota checks. Defaults to 60.
+        max_errors (int, optional): Consecutive failed polls before the queue stops. Defaults to 5.
+    """
+
+    def __init__(
+        self, max_concurrent: int = 2000, poll_interval: float = 60, max_errors: int = 5
+    ):
+        self.max_concurrent = max_concurrent
+        self.poll_interval = poll_interval
+        self.max_errors = max_errors
+        self.started: List[ee.batch.Task] = []
+        self.failed: List[tuple] = []
+        self.errors: List[Exception] = []
+        self._pending = collections.deque()
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._closing = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def enqueue(self, task: ee.batch.Task) -> None:
+        """
+        Queues an unstarted export task, e.g. from ee.batch.Export.image.toDrive.
+
+        Args:
+            task (ee.batch.Task): The task to start once a slot is free.
+
+        Raises:
+            RuntimeError: If the queue has stopped.
+        """
+        if self._stop.is_set():
+            raise RuntimeError("TaskQueue has stopped and no longer starts tasks")
+        with self._lock:
+            self._pending.append(task)
+        self._wake.set()
+
+    def close(self, timeout: float = None) -> List[ee.batch.Task]:
+        """
+        Waits until every queued task has been started and stops the background thread.
+
+        The wait also ends when the queue stops after `max_errors` consecutive failed
+        polls. No further tasks are started once close() returns or raises.
+
+        Args:
+            timeout (float, optional): Seconds to wait before giving up. Defaults to waiting until the queue is empty or stops.
+
+        Returns:
+            List[ee.batch.Task]: All tasks started by the queue.
+
+        Raises:
+            RuntimeError: If any queued task is not confirmed as started when the wait ends.
+        """
+        self._closing = True
+        self._wake.set()
+        self._thread.join(timeout)
+
+        # Stop a thread that is still retrying so nothing starts after close()
+        self._stop.set()
+        self._wake.set()
+
+        with self._lock:
+            unstarted = len(self._pending) + self._in_flight
+            started = list(self.started)
+        if unstarted:
+            last_error = self.errors[-1] if self.errors else None
+            raise RuntimeError(
+                f"{unstarted} export tasks were not started "
+                f"(last error: {last_error!r})"
+            )
+        return started
+
+    def _has_pending(self) -> bool:
+        with self._lock:
+            return bool(self._pending)
+
+    def _requeue(self, task: ee.batch.Task) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            self._pending.appendleft(task)
+
+    def _active_count(self) -> int:
+        # Operations that are not done are still pending or running
+        return sum(1 for op in ee.data.listOperations() if not op.get("done"))
+
+    def _start_available(self) -> None:
+        free = self.max_concurrent - self._active_count()
+        while free > 0 and not self._stop.is_set():
+            with self._lock:
+                if not self._pending:
+                    return
+                task = self._pending.popleft()
+                self._in_flight += 1
+
+            try:
+                task.start()
+            except ee.EEException as e:
+                if any(s in str(e).lower() for s in _RETRYABLE_START_ERRORS):
+                    # Over quota despite the count; wait for the next poll
+                    self._requeue(task)
+                    return
+                with self._lock:
+                    self._in_flight -= 1
+                    self.failed.append((task, e))
+            except Exception:
+                # Not a rejection of the task itself; keep it for the next poll
+                self._requeue(task)
+                raise
+            else:
+                with self._lock:
+                    self._in_flight -= 1
+                    self.started.append(task)
+                free -= 1
+
+    def _run(self) -> None:
+        consecutive_errors = 0
+        while not self._stop.is_set():
+            self._wake.clear()
+            if self._has_pending():
+                try:
+                    self._start_available()
+                except Exception as e:  # Keep the thread alive; retry next poll
+                    self.errors.append(e)
+                    consecutive_errors += 1
+                    if consecutive_errors >= self.max_errors:
+                        self._stop.set()
+                        return
+                else:
+                    consecutive_errors = 0
+            if self._closing and not self._has_pending():
+                return
+            self._wake.wait(self.poll_interval)
+
+
+def fetch_once(values: Union[Dict[str, Any], ee.Dictionary]) -> Dict[str, Any]:
+    """
+    Resolves several Earth Engine values with a single getInfo() call.
+
+    Calling getInfo() per value costs one round-trip each; packing the values into one
+    ee.Dictionary costs a single round-trip in total. Prefer this over per-key getInfo().
+
+    Args:
+        values (Union[Dict[str, Any], ee.Dictionary]): Earth Engine objects keyed by name.
+
+    Returns:
+        Dict[str, Any]: The resolved values under the same keys.
+    """
+    return ee.Dictionary(values).getInfo()
+
+
+def _iso_to_ee_date(date: Union[datetime.date, datetime.datetime]) -> ee.Date:
+    return ee.Date(date.isoformat())
+
+
+# Converters for the exact types accepted by date_to_ee_date
+_DATE_DISPATCH = {
+    str: ee.Date,
+    datetime.date: _iso_to_ee_date,
+    datetime.datetime: _iso_to_ee_date,
+}
+
+
 def date_to_ee_date(date: Union[str, datetime.date, datetime.datetime]) -> ee.Date:
     """
     Converts a Python date or datetime object, or a date string, to an ee.Date object.
@@ -99,10 +343,15 @@ def date_to_ee_date(date: Union[str, datetime.date, datetime.datetime]) -> ee.Da
     Returns:
         ee.Date: The converted Earth Engine date.
     """
+    # Exact types resolve with one dict lookup; subclasses fall back to isinstance
+    convert = _DATE_DISPATCH.get(type(date))
+    if convert is not None:
+        return convert(date)
+
     if isinstance(date, str):
         return ee.Date(date)
     elif isinstance(date, (datetime.date, datetime.datetime)):
-        return ee.Date(date.isoformat())
+        return _iso_to_ee_date(date)
     else:
         raise ValueError("Invalid date format. Use a string, date, or datetime object.")
 
@@ -117,7 +366,8 @@ def add_timestamp_band(image: ee.Image) -> ee.Image:
     Returns:
         ee.Image: The image with an added timestamp band.
     """
-    return image.addBands(ee.Image(image.date().millis()).rename("timestamp").toLong())
+    timestamp = ee.Image.constant(image.date().millis()).toInt64().rename("timestamp")
+    return image.addBands(timestamp)
 
 
 def replace_masked_values(
@@ -139,7 +389,9 @@ def replace_masked_values(
     else:
         mask = image.mask()
 
-    return image.unmask(value).updateMask(mask.Not().Not())
+    # A single comparison binarizes the mask like the former double Not() did:
+    # partially valid pixels (mask between 0 and 1) count as fully valid
+    return image.unmask(value).updateMask(mask.gt(0))
 
 
 def clip_to_region(
@@ -148,6 +400,10 @@ def clip_to_region(
     """
     Clips an image or image collection to a specified region.
 
+    Collection images whose footprint already lies within the region are returned
+    unclipped. The check runs server-side with ee.Algorithms.If, so it saves the
+    per-pixel clip mask on Earth Engine, not any client-side work.
+
     Args:
         image_or_collection (Union[ee.Image, ee.ImageCollection]): The input image or image collection.
         region (ee.Geometry): The region to clip to.
@@ -158,11 +414,33 @@ def clip_to_region(
     if isinstance(image_or_collection, ee.Image):
         return image_or_collection.clip(region)
     elif isinstance(image_or_collection, ee.ImageCollection):
-        return image_or_collection.map(lambda img: img.clip(region))
+        return image_or_collection.map(
+            lambda img: ee.Image(
+                ee.Algorithms.If(
+                    img.geometry().containedIn(region, 1), img, img.clip(region)
+                )
+            )
+        )
     else:
         raise ValueError("Input must be an ee.Image or ee.ImageCollection")
 
 
+# Combined mean/stdDev/minMax reducer, built on first use by _stats_reducer()
+_STATS_REDUCER = None
+
+
+def _stats_reducer() -> ee.Reducer:
+    # Built lazily because Earth Engine may not be initialized at import time
+    global _STATS_REDUCER
+    if _STATS_REDUCER is None:
+        _STATS_REDUCER = (
+            ee.Reducer.mean()
+            .combine(reducer2=ee.Reducer.stdDev(), sharedInputs=True)
+            .combine(reducer2=ee.Reducer.minMax(), sharedInputs=True)
+        )
+    return _STATS_REDUCER
+
+
 def get_image_stats(
     image: ee.Image, region: ee.Geometry, scale: int = 30, max_pixels: int = 1e9
 ) -> Dict[str, Any]:
@@ -179,9 +457,7 @@ def get_image_stats(
         Dict[str, Any]: A dictionary containing the statistics for each band.
     """
     stats = image.reduceRegion(
-        reducer=ee.Reducer.mean()
-        .combine(reducer2=ee.Reducer.stdDev(), sharedInputs=True)
-        .combine(reducer2=ee.Reducer.minMax(), sharedInputs=True),
+        reducer=_stats_reducer(),
         geometry=region,
         scale=scale,
         maxPixels=max_pixels,
@@ -189,11 +465,124 @@ def get_image_stats(
     return stats.getInfo()
 
 
+def init_highvolume(project: str = None) -> None:
+    """
+    Initializes Earth Engine against the high-volume endpoint.
+
+    The high-volume endpoint is meant for many concurrent automated requests, such as
+    fetching results for many images in parallel. Each worker process must call it.
+
+    Args:
+        project (str, optional): The Google Cloud project to use. Defaults to the project of the credentials.
+    """
+    ee.Initialize(project=project, opt_url=HIGH_VOLUME_URL)
+
+
+def _image_stats_worker(
+    image_id: str, region_json: str, scale: int, max_pixels: int
+) -> Dict[str, Any]:
+    region = ee.Geometry(ee.deserializer.fromJSON(region_json))
+    return get_image_stats(ee.Image(image_id), region, scale, max_pixels)
+
+
+def get_image_stats_parallel(
+    image_ids: List[str],
+    region: ee.Geometry,
+    scale: int = 30,
+    max_pixels: int = 1e9,
+    processes: int = 25,
+    project: str = None,
+) -> List[Dict[str, Any]]:
+    """
+    Calculates get_image_stats for many images concurrently on the high-volume endpoint.
+
+    Each image costs one request, so the requests are spread over a pool of worker
+    processes instead of being issued one after another. Workers are spawned rather
+    than forked because the Earth Engine client is not fork-safe.
+
+    Args:
+        image_ids (List[str]): Asset IDs of the images, e.g. from a date series.
+        region (ee.Geometry): The region to calculate statistics for.
+        scale (int, optional): The scale in meters of the projection to work in. Defaults to 30.
+        max_pixels (int, optional): The maximum number of pixels to reduce. Defaults to 1e9.
+        processes (int, optional): The number of worker processes. Defaults to 25.
+        project (str, optional): The Google Cloud project to use. Defaults to the project of the credentials.
+
+    Returns:
+        List[Dict[str, Any]]: The statistics for each image, in the order of image_ids.
+    """
+    import multiprocessing
+
+    region_json = region.serialize()
+    tasks = [(image_id, region_json, scale, max_pixels) for image_id in image_ids]
+
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(
+        processes, initializer=init_highvolume, initargs=(project,)
+    ) as pool:
+        return pool.starmap(_image_stats_worker, tasks)
+
+
+def _download_worker(image_json: str, region_json: str, scale: float, path: str) -> str:
+    import urllib.request
+
+    image = ee.Image(ee.deserializer.fromJSON(image_json))
+    region = ee.Geometry(ee.deserializer.fromJSON(region_json))
+    url = image.getDownloadURL({"region": region, "scale": scale, "format": "GEO_TIFF"})
+    urllib.request.urlretrieve(url, path)
+    return path
+
+
+def download_images_parallel(
+    images: List[ee.Image],
+    region: ee.Geometry,
+    out_dir: str,
+    scale: float = 30,
+    processes: int = 25,
+    project: str = None,
+) -> List[str]:
+    """
+    Downloads small images as GeoTIFFs concurrently on the high-volume endpoint.
+
+    Unlike batch exports, getDownloadURL requests do not count against the task quota
+    and return immediately, which makes them faster for small outputs. Each request is
+    limited to about 32 MB, so use the export functions for larger images.
+
+    Args:
+        images (List[ee.Image]): The images to download.
+        region (ee.Geometry): The region to download.
+        out_dir (str): Directory to write the files to, named image_<index>.tif.
+        scale (float, optional): The resolution in meters per pixel. Defaults to 30.
+        processes (int, optional): The number of worker processes. Defaults to 25.
+        project (str, optional): The Google Cloud project to use. Defaults to the project of the credentials.
+
+    Returns:
+        List[str]: Paths of the downloaded files, in the order of images.
+    """
+    import multiprocessing
+
+    os.makedirs(out_dir, exist_ok=True)
+    region_json = region.serialize()
+    tasks = [
+        (image.serialize(), region_json, scale, os.path.join(out_dir, f"image_{i}.tif"))
+        for i, image in enumerate(images)
+    ]
+
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(
+        processes, initializer=init_highvolume, initargs=(project,)
+    ) as pool:
+        return pool.starmap(_download_worker, tasks)
+
+
 def create_ee_polygon_from_bounds(
     min_lon: float, min_lat: float, max_lon: float, max_lat: float
-) -> ee.Geometry.Polygon:
+) -> ee.Geometry:
     """
-    Creates an Earth Engine Polygon from bounding coordinates.
+    Creates an Earth Engine rectangle from bounding coordinates.
+
+    The rectangle is planar (geodesic=False) in EPSG:4326, so its edges follow lines of
+    constant latitude and longitude and are not densified into great-circle segments.
 
     Args:
         min_lon (float): Minimum longitude.
@@ -202,16 +591,10 @@ def create_ee_polygon_from_bounds(
         max_lat (float): Maximum latitude.
 
     Returns:
-        ee.Geometry.Polygon: An Earth Engine Polygon object.
-    """
-    return ee.Geometry.Polygon(
-        [
-            [min_lon, min_lat],
-            [min_lon, max_lat],
-            [max_lon, max_lat],
-            [max_lon, min_lat],
-            [min_lon, min_lat],
-        ]
+        ee.Geometry: An Earth Engine rectangle geometry.
+    """
+    return ee.Geometry.Rectangle(
+        [min_lon, min_lat, max_lon, max_lat], proj="EPSG:4326", geodesic=False
     )
 
 
@@ -225,8 +608,88 @@ def apply_scale_factors(image: ee.Image) -> ee.Image:
     Returns:
         ee.Image: Landsat image with scale factors applied.
     """
-    optical_bands = image.select("SR_B.").multiply(0.0000275).add(-0.2)
-    thermal_bands = (
-        image.select("ST_B.*").multiply(0.00341802).add(149.0).subtract(273.15)
+    # One fused expression per band group; the thermal offset 149.0 - 273.15 is
+    # folded into a single constant so the result is in degrees Celsius.
+    optical_bands = image.expression(
+        "b * 0.0000275 - 0.2", {"b": image.select("SR_B.")}
+    )
+    thermal_bands = image.expression(
+        "b * 0.00341802 - 124.15", {"b": image.select("ST_B.*")}
+    )
+    return image.addBands(ee.Image.cat([optical_bands, thermal_bands]), None, True)
+
+
+def save_index(arr: np.ndarray, path: str, profile: Dict[str, Any]) -> None:
+    """
+    Saves a local index array as a tiled, compressed GeoTIFF with overviews.
+
+    The file is written in 256x256 blocks with LZW compression and the floating-point
+    predictor, and gets average-resampled overviews at factors 2, 4, 8, and 16, so
+    that reading a window or a zoomed-out view only touches the blocks it needs.
+    Requires rasterio.
+
+    Args:
+        arr (np.ndarray): 2-D index array, e.g. from local_indices. NaNs are written as INDEX_NODATA.
+        path (str): Destination file path.
+        profile (Dict[str, Any]): Rasterio profile with at least the CRS, transform, width, and height.
+    """
+    import rasterio
+    from rasterio.enums import Resampling
+
+    profile = dict(profile)
+    profile.update(
+        driver="GTiff",
+        count=1,
+        dtype="float32",
+        compress="lzw",
+        # Floating-point predictor; predictor 2 (differencing) is meant for integers
+        predictor=3,
+        tiled=True,
+        blockxsize=256,
+        blockysize=256,
+        nodata=INDEX_NODATA,
+    )
+    data = np.asarray(arr, dtype=np.float32)
+    data = np.where(np.isfinite(data), data, np.float32(INDEX_NODATA))
+
+    with rasterio.open(path, "w", **profile) as dst:
+        dst.write(data, 1)
+
+    with rasterio.open(path, "r+") as dst:
+        dst.build_overviews([2, 4, 8, 16], Resampling.average)
+        dst.update_tags(ns="rio_overview", resampling="average")
+
+
+def save_index_zarr(
+    arr: np.ndarray, path: str, name: str = "index", chunks: tuple = (1, 256, 256)
+) -> None:
+    """
+    Saves local index arrays as a chunked, Zstandard-compressed Zarr store.
+
+    Chunked storage lets readers load single tiles, in parallel, without reading the
+    whole array. The store is written in Zarr format 3. Requires xarray and
+    zarr-python 3 or later; dask is not needed.
+
+    Args:
+        arr (np.ndarray): 2-D index array or 3-D stack of index arrays (band, y, x).
+        path (str): Destination path of the Zarr store.
+        name (str, optional): Name of the variable in the store. Defaults to "index".
+        chunks (tuple, optional): Chunk shape as (band, y, x). Defaults to (1, 256, 256).
+    """
+    import xarray as xr
+    from zarr.codecs import ZstdCodec
+
+    data = np.asarray(arr, dtype=np.float32)
+    if data.ndim == 2:
+        data = data[np.newaxis]
+
+    # Chunking is set through the encoding, so the in-memory array stays a NumPy
+    # array and no dask chunk manager is required
+    data_array = xr.DataArray(data, dims=("band", "y", "x"), name=name)
+    data_array.to_dataset().to_zarr(
+        path,
+        mode="w",
+        zarr_format=3,
+        consolidated=False,
+        encoding={name: {"chunks": chunks, "compressors": [ZstdCodec(level=3)]}},
     )
-    return image.addBands(optical_bands, None, True).addBands(thermal_bands, None, True)
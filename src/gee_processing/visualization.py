@@ -1,8 +1,46 @@
+from __future__ import annotations
+
 import ee
-import geemap
-import folium
-from typing import Dict, List, Union
-import matplotlib.pyplot as plt
+from typing import TYPE_CHECKING, Dict, List, Tuple, Union
+from .utils import fetch_once
+
+# geemap and matplotlib are slow to import, so they are imported where they are used
+if TYPE_CHECKING:
+    import geemap
+    import matplotlib.pyplot as plt
+
+# Blue-to-red LST palette, shared by all LST visualization parameters
+_LST_PALETTE: Tuple[str, ...] = (
+    "040274",
+    "040281",
+    "0502a3",
+    "0502b8",
+    "0502ce",
+    "0502e6",
+    "0602ff",
+    "235cb1",
+    "307ef3",
+    "269db1",
+    "30c8e2",
+    "32d3ef",
+    "3be285",
+    "3ff38f",
+    "86e26f",
+    "3ae237",
+    "b5e22e",
+    "d6e21f",
+    "fff705",
+    "ffd611",
+    "ffb613",
+    "ff8b13",
+    "ff6e08",
+    "ff500d",
+    "ff0000",
+    "de0101",
+    "c21301",
+    "a71001",
+    "911003",
+)
 
 
 def create_map(center: List[float], zoom: int = 9) -> geemap.Map:
@@ -16,6 +54,8 @@ def create_map(center: List[float], zoom: int = 9) -> geemap.Map:
     Returns:
         geemap.Map: A geemap Map object.
     """
+    import geemap
+
     return geemap.Map(center=center, zoom=zoom)
 
 
@@ -102,64 +142,42 @@ def create_lst_vis_params(min_value: float, max_value: float) -> Dict:
     return {
         "min": min_value,
         "max": max_value,
-        "palette": [
-            "040274",
-            "040281",
-            "0502a3",
-            "0502b8",
-            "0502ce",
-            "0502e6",
-            "0602ff",
-            "235cb1",
-            "307ef3",
-            "269db1",
-            "30c8e2",
-            "32d3ef",
-            "3be285",
-            "3ff38f",
-            "86e26f",
-            "3ae237",
-            "b5e22e",
-            "d6e21f",
-            "fff705",
-            "ffd611",
-            "ffb613",
-            "ff8b13",
-            "ff6e08",
-            "ff500d",
-            "ff0000",
-            "de0101",
-            "c21301",
-            "a71001",
-            "911003",
-        ],
+        "palette": _LST_PALETTE,
     }
 
 
 def create_scatter_plot(
-    x: ee.Array, y: ee.Array, x_label: str, y_label: str, title: str
+    x: ee.Image,
+    y: ee.Image,
+    x_label: str,
+    y_label: str,
+    title: str,
+    region: ee.Geometry,
 ) -> plt.Figure:
     """
-    Creates a scatter plot using Earth Engine arrays.
+    Creates a scatter plot of two Earth Engine images sampled over a region.
 
     Args:
-        x (ee.Array): Array of x-values.
-        y (ee.Array): Array of y-values.
+        x (ee.Image): Image whose first band gives the x-values.
+        y (ee.Image): Image whose first band gives the y-values.
         x_label (str): Label for x-axis.
         y_label (str): Label for y-axis.
         title (str): Title of the plot.
+        region (ee.Geometry): Region to sample 1000 pixels from.
 
     Returns:
         plt.Figure: A matplotlib Figure object containing the scatter plot.
     """
-    # Sample points from the image
-    points = ee.FeatureCollection.randomPoints(ROI, 1000)
-    values = x.addBands(y).reduceRegion(
-        reducer=ee.Reducer.toList(), geometry=points, scale=30, maxPixels=1e9
+    # Sample pixel pairs and extract their values in a single server-side pass
+    samples = (
+        x.select([0], ["x"])
+        .addBands(y.select([0], ["y"]))
+        .sample(region=region, scale=30, numPixels=1000, seed=0, geometries=False)
     )
+    pairs = samples.reduceColumns(ee.Reducer.toList(2), ["x", "y"]).getInfo()["list"]
+    x_values, y_values = zip(*pairs) if pairs else ((), ())
 
-    x_values = values.get(x.bandNames().get(0)).getInfo()
-    y_values = values.get(y.bandNames().get(0)).getInfo()
+    import matplotlib.pyplot as plt
 
     fig, ax = plt.subplots()
     ax.scatter(x_values, y_values, alpha=0.5)
@@ -193,14 +211,16 @@ def visualize_downscaling_results(
     map_obj = create_map(center, zoom)
 
     # Get LST range for visualization
-    lst_range = original_lst.reduceRegion(
-        reducer=ee.Reducer.minMax(),
-        geometry=region,
-        scale=30,
-        maxPixels=1e9,
+    lst_range = fetch_once(
+        original_lst.reduceRegion(
+            reducer=ee.Reducer.minMax(),
+            geometry=region,
+            scale=30,
+            maxPixels=1e9,
+        )
     )
-    min_lst = lst_range.get("LST_min").getInfo()
-    max_lst = lst_range.get("LST_max").getInfo()
+    min_lst = lst_range["LST_min"]
+    max_lst = lst_range["LST_max"]
 
     lst_vis_params = create_lst_vis_params(min_lst, max_lst)
 